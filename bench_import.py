@@ -0,0 +1,110 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : bench_import.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Description  : Import time of the agent.
+#
+# Additional Comments:
+#   Times "import wb4s_agent" in fresh interpreters, the startup cost every
+#   simulation pays, against the reference of importing uvm and cocotb alone,
+#   which the agent cannot avoid, and checks the optional parts stay unloaded.
+#
+#   python bench_import.py [runs]
+##################################################################################################
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules wb4s_agent must not import until they are used.
+LAZY_MODULES = ("wb4s_stream_subscriber", "wb4s_shm_ring", "multiprocessing.shared_memory",
+                "wb4s_flight_recorder", "wb4s_signature", "wb4s_regression")
+
+# Import measured by the reference runs, the libraries the agent is built on.
+REFERENCE = "import cocotb, uvm"
+
+_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print("wb4s_import_time=%%r" %% elapsed)
+print("wb4s_loaded=" + ",".join(name for name in %r if name in sys.modules))
+"""
+
+
+def measure(runs=10, statement="import wb4s_agent"):
+    """
+       Function: measure
+
+       Definition: Returns the import times in seconds, one per fresh
+                   interpreter, and the lazy modules that were loaded anyway.
+
+       Args:
+         runs: Number of interpreters started.
+         statement: Import statement timed.
+    """
+    here   = os.path.dirname(os.path.abspath(__file__))
+    env    = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+    times  = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _SNIPPET % (statement, LAZY_MODULES)], env=env, check=True,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+        # uvm prints its banner on stdout too, keep only our lines.
+        values = dict(line.split("=", 1) for line in out.splitlines() if line.startswith("wb4s_"))
+        times.append(float(values["wb4s_import_time"]))
+        loaded.update(name for name in values["wb4s_loaded"].split(",") if name)
+    return times, loaded
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    runs = int(argv[0]) if argv else 10
+    reference, _  = measure(runs, REFERENCE)
+    times, loaded = measure(runs)
+    agent = statistics.median(times)
+    base  = statistics.median(reference)
+    print("%s: min %.1f ms, median %.1f ms over %d runs" % (REFERENCE, min(reference) * 1e3, base * 1e3, runs))
+    print("import wb4s_agent: min %.1f ms, median %.1f ms over %d runs" % (
+          min(times) * 1e3, agent * 1e3, runs))
+    print("wb4s modules: %+.1f ms over the reference (%.2fx)" % ((agent - base) * 1e3, agent / base))
+    if loaded:
+        print("lazy modules loaded at import: " + ", ".join(sorted(loaded)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : test_wb4s_seq.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Description  : Tests of the wb4s_seq fast clone and creator.
+#
+# Additional Comments:
+#   Runs without a simulator: python -m pytest test_wb4s_seq.py
+##################################################################################################
+import pytest
+
+pytest.importorskip("uvm")
+
+from uvm.base.uvm_factory import UVMFactory
+from uvm.macros import uvm_object_utils
+#
+from wb4s_seq import wb4s_seq, wb4s_seq_creator
+
+
+class wb4s_test_seq(wb4s_seq):
+    # Override type used by the factory test.
+    def __init__(self, name="wb4s_test_seq"):
+        super().__init__(name)
+        self.extra = 7
+
+
+uvm_object_utils(wb4s_test_seq)
+
+
+class wb4s_list_seq(wb4s_seq):
+    # Override type with a mutable field and no clone hook.
+    def __init__(self, name="wb4s_list_seq"):
+        super().__init__(name)
+        self.data = []
+
+
+uvm_object_utils(wb4s_list_seq)
+
+
+class wb4s_burst_seq(wb4s_seq):
+    # Override type that keeps the fast clone for its mutable field.
+    _CLONE_FIELDS = wb4s_seq._CLONE_FIELDS + ("burst",)
+
+    def __init__(self, name="wb4s_burst_seq"):
+        super().__init__(name)
+        self.burst = []
+
+    def do_copy(self, rhs):
+        super().do_copy(rhs)
+        self.burst = list(rhs.burst)
+
+
+uvm_object_utils(wb4s_burst_seq)
+
+
+def make_item():
+    tr = wb4s_seq("tr")
+    tr.address        = 0x40
+    tr.data_in        = 0x1234
+    tr.data_out       = 0xbeef
+    tr.select         = 0xf
+    tr.we             = 1
+    tr.stall          = 1
+    tr.acknowledge    = 1
+    tr.transmit_delay = 3
+    return tr
+
+
+def test_do_clone_matches_copy():
+    tr     = make_item()
+    cloned = tr.do_clone()
+    copied = wb4s_seq("copied")
+    copied.copy(tr)
+    assert type(cloned) is wb4s_seq
+    assert cloned.compare(tr)
+    assert cloned.compare(copied)
+    assert cloned.get_inst_id() != tr.get_inst_id()
+    cloned.address = 0x80
+    assert tr.address == 0x40
+
+
+def test_clone_uses_do_clone(monkeypatch):
+    tr    = make_item()
+    calls = []
+    fast  = wb4s_seq.do_clone
+    monkeypatch.setattr(wb4s_seq, "do_clone", lambda self: calls.append(self) or fast(self))
+    cloned = tr.clone()
+    assert calls == [tr]
+    assert cloned.compare(tr)
+
+
+def test_do_clone_reseeds():
+    tr    = make_item()
+    first = tr.do_clone()
+    other = tr.do_clone()
+    assert first._sv_seed != tr._sv_seed
+    assert first._sv_seed != other._sv_seed
+
+
+def test_do_clone_does_not_share_subclass_fields():
+    for cls in (wb4s_list_seq, wb4s_burst_seq):
+        tr = cls("tr")
+        tr.address = 0x40
+        cloned = tr.do_clone()
+        assert type(cloned) is cls
+        assert cloned.compare(tr)
+        field = "data" if cls is wb4s_list_seq else "burst"
+        getattr(cloned, field).append(1)
+        assert getattr(tr, field) == []
+
+
+def test_do_clone_has_own_transaction_state():
+    tr = make_item()
+    tr.begin_time = 10
+    tr.events.get("user")
+    cloned = tr.do_clone()
+    assert cloned.events is not tr.events
+    assert cloned.begin_event is cloned.events.get("begin")
+    assert cloned.begin_event is not tr.begin_event
+    assert cloned.end_event is not tr.end_event
+    assert cloned.begin_time == -1
+    assert cloned.tr_recorder is None
+
+
+def test_creator_honors_factory_override():
+    assert type(wb4s_seq_creator("tr").create()) is wb4s_seq
+    UVMFactory.get().set_type_override_by_type(wb4s_seq.get_type(), wb4s_test_seq.get_type())
+    try:
+        creator = wb4s_seq_creator("tr")
+        first   = creator.create()
+        second  = creator.create()
+        assert type(first) is wb4s_test_seq
+        assert first.extra == 7
+        assert first is not second
+        assert first.compare(second)
+        UVMFactory.get().set_type_override_by_type(wb4s_seq.get_type(), wb4s_list_seq.get_type())
+        creator = wb4s_seq_creator("tr")
+        first   = creator.create()
+        first.data.append(1)
+        assert creator.create().data == []
+    finally:
+        UVMFactory.get().set_type_override_by_type(wb4s_seq.get_type(), wb4s_seq.get_type())
@@ -39,11 +39,43 @@
 # Additional Comments:
 #   The agent's components instantiations and connections.
 ##################################################################################################
-from uvm import *
-from wb4s_if import *
-from wb4s_driver import *
-from wb4s_sequencer import *
-from wb4s_monitor import *
+import importlib
+#
+from uvm.base.uvm_object_globals import UVM_ERROR, UVM_FATAL
+from uvm.base.uvm_report_server import UVMReportServer
+from uvm.comps.uvm_agent import UVMAgent
+from uvm.tlm1.uvm_analysis_port import UVMAnalysisPort
+from uvm.macros import uvm_component_utils
+#
+from wb4s_config import wb4s_config
+from wb4s_driver import wb4s_driver
+from wb4s_sequencer import wb4s_sequencer
+from wb4s_monitor import wb4s_monitor
+from wb4s_seq import wb4s_seq, wb4s_base_sequence, wb4s_single_read_seq, wb4s_single_write_seq
+
+# Optional parts of the agent, imported the first time they are used.
+_LAZY = {"wb4s_stream_subscriber" : "wb4s_stream_subscriber",
+         "wb4s_shm_ring"          : "wb4s_shm_ring",
+         "wb4s_stream_consumer"   : "wb4s_shm_ring"}
+
+__all__ = ["wb4s_agent",
+           "wb4s_driver",
+           "wb4s_sequencer",
+           "wb4s_monitor",
+           "wb4s_seq",
+           "wb4s_config",
+           "wb4s_base_sequence",
+           "wb4s_single_read_seq",
+           "wb4s_single_write_seq"]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
+
 
 class wb4s_agent(UVMAgent):
     """         
@@ -87,11 +119,12 @@ class wb4s_agent(UVMAgent):
         
         if (self.cfg.has_driver == 1):
             self.drv = wb4s_driver.type_id.create("drv", self)
-            # self.sqr = wb4s_agent_sequencer.type_id.create("sqr", self)
-            self.sqr = UVMSequencer.type_id.create("sqr", self)
+            self.drv.cfg = self.cfg
+            self.sqr = wb4s_sequencer.type_id.create("sqr", self)
        
         if (self.cfg.has_monitor == 1):
             self.mon = wb4s_monitor.type_id.create("mon", self)
+            self.mon.cfg = self.cfg
 
 
     def connect_phase(self, phase):
@@ -109,7 +142,24 @@ class wb4s_agent(UVMAgent):
        
         if (self.cfg.has_driver):
             self.drv.seq_item_port.connect(self.sqr.seq_item_export) # Driver Connection
+            if isinstance(self.drv, wb4s_driver):
+                self.drv.sqr = self.sqr # Bulk item hand off
+                self.sqr.bulk_consumer = True
             self.drv.vif = self.cfg.vif
 
 
+    def report_phase(self, phase):
+        """         
+           Function: report_phase
+          
+           Definition: Records the error count for wb4s_regression.
+
+           Args:
+             phase: report_phase
+        """
+        from wb4s_regression import record_result
+        server = UVMReportServer.get_server()
+        record_result(uvm_errors=server.get_severity_count(UVM_ERROR) + server.get_severity_count(UVM_FATAL))
+
+
 uvm_component_utils(wb4s_agent)
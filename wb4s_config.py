@@ -39,9 +39,9 @@
 # Additional Comments:
 #
 ##################################################################################################
-from uvm.base.uvm_object import *
-from uvm.macros import *
-from wb4s_if import *
+from uvm.base.uvm_object import UVMObject
+from uvm.macros import uvm_object_utils
+from wb4s_if import wb4s_if
 
 class wb4s_config(UVMObject):
     """         
@@ -65,6 +65,16 @@ class wb4s_config(UVMObject):
         self.vif              = None # wb4s_if
         self.has_driver       = None
         self.has_monitor      = None
+        self.flight_depth     = 256  # transactions kept by the flight recorders, 0 disables them
+        self.flight_samples   = 256  # clock samples kept by the monitor's flight recorder
+        self.flight_file      = None # file the flight recorders dump to, None dumps to the log
+        self.has_signature    = 1    # the monitor keeps a stream signature, 0 disables it
+        self.signature_fields = None # fields in the stream signature, None is all but transmit_delay
+        self.signature_window = 1024 # transactions per signature checkpoint
+        self.signature_golden = None # golden signature file compared at the end of the test
+        self.signature_file   = None # file this run's signature is saved to
+        self.idle_threshold   = 4    # idle clocks before the monitor sleeps until cyc_i/stb_i rise, 0 disables
+        self.filter           = None # wb4s_filter applied by the monitor, None passes every request
 
 
     def build_phase(self, phase):
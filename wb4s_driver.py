@@ -39,16 +39,12 @@
 # Additional Comments:
 #   This driver drives the signals to respond to a WB Master.
 ##################################################################################################
-import cocotb
-from cocotb.triggers import *
+from cocotb.triggers import Event, FallingEdge, RisingEdge, Timer
 
-from uvm import *
-from uvm.base import *
 from uvm.comps import UVMDriver
-from uvm.macros import uvm_component_utils, uvm_info
+from uvm.macros import uvm_component_utils
 
-from wb4s_seq import *
-from wb4s_if import *
+from wb4s_if import wb4s_if
 
 class wb4s_driver(UVMDriver):
     """         
@@ -75,6 +71,9 @@ class wb4s_driver(UVMDriver):
         self.tag  = "wb4s_driver_" + name
         self.data = 0
         self.cfg  = None
+        self.sqr  = None  # wb4s_sequencer, set by the agent to enable bulk item hand off
+        self.bulk = 8     # maximum items taken from the sequencer fast FIFO at once
+        self.recorder = None  # wb4s_flight_recorder of the driven items
 
 
     def build_phase(self, phase):
@@ -87,6 +86,10 @@ class wb4s_driver(UVMDriver):
            Args:
              phase: build_phase
         """
+        if (self.cfg is not None and self.cfg.flight_depth > 0):
+            from wb4s_flight_recorder import wb4s_flight_recorder
+            self.recorder = wb4s_flight_recorder(self.get_full_name(), self.cfg.flight_depth, 0,
+                                                 self.cfg.flight_file)
 
     
     async def run_phase(self, phase):
@@ -129,12 +132,21 @@ class wb4s_driver(UVMDriver):
         self.vif.sel_i <= tr.select
         self.vif.tgd_i <= tr.data_tag
         self.vif.tgc_i <= tr.cycle_tag
+        if (self.recorder is not None):
+            self.recorder.record(tr)
         
         if (self.vif.stall_o == 1):
             await FallingEdge(self.vif.stall_o)
 
 
     async def get_and_drive(self, phase):
+        if (self.sqr is not None):
+            if (self.sqr.has_items()):
+                await self.drive_items(phase)
+                return
+            if not self.sqr.has_do_available():
+                # Nothing to drive on this clock.
+                return
         tr = []
         # Drives signals with sequences
         await self.seq_item_port.get_next_item(tr)
@@ -146,6 +158,19 @@ class wb4s_driver(UVMDriver):
         self.trig.set()
 
 
+    async def drive_items(self, phase):
+        # Drives a batch from the sequencer fast FIFO, one item per clock.
+        items = self.sqr.try_next_items(self.bulk)
+        phase.raise_objection(self, self.tag + "objection")
+        for index, tr in enumerate(items):
+            if (index > 0):
+                await RisingEdge(self.vif.clk_i)
+            await self.feed_data(tr)
+        self.sqr.items_done(len(items))
+        phase.drop_objection(self, "wb4s_driver drop objection")
+        self.trig.set()
+
+
     async def reset_signals(self):
         # Hold signals low while reset
         self.vif.stb_i <= 0
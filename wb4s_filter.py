@@ -0,0 +1,163 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_filter.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_filter
+# Description  : Request filter applied by the monitor.
+#
+# Additional Comments:
+#   The monitor checks the sampled request against the filter before it
+#   builds, logs or publishes a transaction, so subscribers only pay for the
+#   traffic they asked for.
+##################################################################################################
+from bisect import bisect_right
+
+# Request side tags a filter can match on.
+TAG_FIELDS = ("address_tag", "data_tag", "cycle_tag")
+
+
+class wb4s_filter():
+    """
+       Class: Wishbone Request Filter
+
+       Definition: Address ranges, we/sel masks, tag matches and 1-in-N
+                   sampling, with a counter of the requests each one rejected.
+                   A request passes when it passes every configured check.
+    """
+
+    def __init__(self):
+        """
+           Function: new
+
+           Definition: Filter constructor, an empty filter passes every request.
+        """
+        self.we           = None  # 0 or 1 to pass only reads or writes
+        self.select_mask  = None  # pass requests with one of these sel_i bits set
+        self.sample_every = 1     # pass one of every N requests that pass the other checks
+        self.tags         = []    # (field, value, mask) matched against the request tags
+        self.starts       = []    # sorted, non overlapping address ranges
+        self.ends         = []
+        self.seen         = 0
+        self.accepted     = 0
+        self.rejected     = {"address": 0, "we": 0, "select": 0, "tag": 0, "sample": 0}
+        self._matched     = 0
+
+
+    def add_range(self, first, last):
+        """
+           Function: add_range
+
+           Definition: Passes requests to addresses first to last, inclusive.
+                       Overlapping or adjacent ranges are merged.
+
+           Args:
+             first: Lowest address of the range.
+             last: Highest address of the range.
+        """
+        if (first > last):
+            raise ValueError("wb4s_filter: range first 0x%x above last 0x%x" % (first, last))
+        ranges = sorted(list(zip(self.starts, self.ends)) + [(first, last)])
+        merged = [list(ranges[0])]
+        for start, end in ranges[1:]:
+            if (start <= merged[-1][1] + 1):
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends   = [end for _, end in merged]
+
+
+    def match_tag(self, field, value, mask=-1):
+        """
+           Function: match_tag
+
+           Definition: Passes requests whose tag, masked, equals value.
+
+           Args:
+             field: One of TAG_FIELDS.
+             value: Expected tag value.
+             mask: Bits of the tag compared.
+        """
+        if field not in TAG_FIELDS:
+            raise ValueError("wb4s_filter: unknown tag field " + field)
+        self.tags.append((TAG_FIELDS.index(field), value & mask, mask))
+
+
+    def in_ranges(self, address):
+        index = bisect_right(self.starts, address) - 1
+        return index >= 0 and address <= self.ends[index]
+
+
+    def accept(self, address, we, select, address_tag, data_tag, cycle_tag):
+        """
+           Function: accept
+
+           Definition: Returns True when the request passes the filter and
+                       updates the counters.
+
+           Args:
+             address: adr_i value.
+             we: we_i value.
+             select: sel_i value.
+             address_tag: tga_i value.
+             data_tag: tgd_i value.
+             cycle_tag: tgc_i value.
+        """
+        self.seen += 1
+        if (self.starts and not self.in_ranges(address)):
+            self.rejected["address"] += 1
+            return False
+        if (self.we is not None and we != self.we):
+            self.rejected["we"] += 1
+            return False
+        if (self.select_mask is not None and not (select & self.select_mask)):
+            self.rejected["select"] += 1
+            return False
+        if self.tags:
+            values = (address_tag, data_tag, cycle_tag)
+            for index, value, mask in self.tags:
+                if (values[index] & mask != value):
+                    self.rejected["tag"] += 1
+                    return False
+        self._matched += 1
+        if (self.sample_every > 1 and (self._matched - 1) % self.sample_every != 0):
+            self.rejected["sample"] += 1
+            return False
+        self.accepted += 1
+        return True
+
+
+    def convert2string(self):
+        return "seen %d accepted %d rejected " % (self.seen, self.accepted) + \
+               " ".join("%s:%d" % (name, count) for name, count in self.rejected.items())
@@ -0,0 +1,200 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_flight_recorder.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_flight_recorder, wb4s_flight_catcher
+# Description  : Ring buffer of the most recent transactions and bus samples.
+#
+# Additional Comments:
+#   Keeps the last transactions and per clock bus samples in preallocated
+#   arrays and only formats them when something goes wrong: a uvm_error or
+#   uvm_fatal from any component, or an explicit trigger() call from a
+#   checker or scoreboard.
+##################################################################################################
+from array import array
+#
+from cocotb.utils import get_sim_time, get_time_from_sim_steps
+#
+from uvm.base.uvm_object_globals import UVM_ERROR, UVM_FATAL, UVM_NONE
+from uvm.base.uvm_report_catcher import THROW, UVMReportCatcher, UVMReportCb
+from uvm.macros import uvm_info
+#
+from wb4s_record import WB4S_RECORD_FIELDS, pack_record
+
+# Bus signals packed into one word per sample, bit n is SAMPLE_SIGNALS[n].
+SAMPLE_SIGNALS = ("cyc_i", "stb_i", "we_i", "stall_o", "ack_o")
+
+_ITEM_WIDTH = len(WB4S_RECORD_FIELDS) + 1  # sim time in steps followed by the fields
+
+
+class wb4s_flight_recorder():
+    """
+       Class: Wishbone Flight Recorder
+
+       Definition: Fixed size history of transactions and bus samples, dumped
+                   to a file or the log when an error fires.
+    """
+
+    def __init__(self, name, depth=256, sample_depth=256, file_name=None):
+        """
+           Function: new
+
+           Definition: Allocates the history and registers the error catcher.
+
+           Args:
+             name: Name used in the dump, usually the owner's full name.
+             depth: Number of transactions kept, 0 disables them.
+             sample_depth: Number of clock samples kept, 0 disables them.
+             file_name: File the dump is appended to, None dumps to the log.
+        """
+        self.name         = name
+        self.depth        = depth
+        self.sample_depth = sample_depth
+        self.file_name    = file_name
+        self.max_dumps    = 1  # dumps per simulation, later errors are not dumped
+        self.dumps        = 0
+        self.num_items    = 0
+        self.num_samples  = 0
+        self.items        = array("Q", [0]) * (depth * _ITEM_WIDTH)
+        self.samples      = array("Q", [0]) * (sample_depth * 2)
+        self.catcher      = wb4s_flight_catcher(self)
+        UVMReportCb.add(None, self.catcher)
+
+
+    def record(self, tr):
+        """
+           Function: record
+
+           Definition: Stores a transaction, overwriting the oldest one.
+
+           Args:
+             tr: wb4s_seq transaction.
+        """
+        if (self.depth == 0):
+            return
+        slot = (self.num_items % self.depth) * _ITEM_WIDTH
+        self.items[slot:slot + _ITEM_WIDTH] = array("Q", (get_sim_time(),) + pack_record(tr))
+        self.num_items += 1
+
+
+    def sample(self, cycle, vif):
+        """
+           Function: sample
+
+           Definition: Stores the control signals of one clock.
+
+           Args:
+             cycle: Clock count of the sample.
+             vif: wb4s_if to sample.
+        """
+        if (self.sample_depth == 0):
+            return
+        bits = 0
+        for index, signal in enumerate(SAMPLE_SIGNALS):
+            if (getattr(vif, signal).value.binstr == "1"):
+                bits |= 1 << index
+        slot = (self.num_samples % self.sample_depth) * 2
+        self.samples[slot]     = cycle
+        self.samples[slot + 1] = bits
+        self.num_samples += 1
+
+
+    def _oldest_first(self, buf, count, depth, width):
+        first = max(0, count - depth)
+        for number in range(first, count):
+            slot = (number % depth) * width
+            yield buf[slot:slot + width]
+
+
+    def format(self, reason):
+        """
+           Function: format
+
+           Definition: Returns the history as text, oldest entries first.
+
+           Args:
+             reason: Why the history is dumped.
+        """
+        lines = ["Flight recorder " + self.name + ": " + reason]
+        lines.append("  Last %d of %d transactions" % (min(self.num_items, self.depth), self.num_items))
+        lines.append("    " + " ".join(["time_ns"] + list(WB4S_RECORD_FIELDS)))
+        for entry in self._oldest_first(self.items, self.num_items, self.depth, _ITEM_WIDTH):
+            lines.append("    %g " % get_time_from_sim_steps(entry[0], "ns") +
+                         " ".join("0x%x" % value for value in entry[1:]))
+        lines.append("  Last %d of %d clock samples" % (min(self.num_samples, self.sample_depth),
+                                                        self.num_samples))
+        lines.append("    " + " ".join(("cycle",) + SAMPLE_SIGNALS))
+        for cycle, bits in self._oldest_first(self.samples, self.num_samples, self.sample_depth, 2):
+            lines.append("    %d " % cycle + " ".join(str((bits >> index) & 1)
+                                                     for index in range(len(SAMPLE_SIGNALS))))
+        return "\n".join(lines)
+
+
+    def trigger(self, reason):
+        """
+           Function: trigger
+
+           Definition: Dumps the history, for checkers that do not report
+                       through uvm_error.
+
+           Args:
+             reason: Why the history is dumped.
+        """
+        if (self.dumps >= self.max_dumps):
+            return
+        self.dumps += 1
+        text = self.format(reason)
+        if self.file_name is None:
+            uvm_info("wb4s_flight_recorder", text, UVM_NONE)
+        else:
+            with open(self.file_name, "a") as f:
+                f.write(text + "\n")
+
+
+class wb4s_flight_catcher(UVMReportCatcher):
+    """
+       Class: Wishbone Flight Recorder Catcher
+
+       Definition: Dumps its recorder on every UVM_ERROR or UVM_FATAL report.
+    """
+
+    def __init__(self, recorder, name="wb4s_flight_catcher"):
+        super().__init__(name)
+        self.recorder = recorder
+
+
+    def catch(self):
+        if (self.get_severity() in (UVM_ERROR, UVM_FATAL)):
+            self.recorder.trigger(self.get_id() + ": " + self.get_message())
+        return THROW
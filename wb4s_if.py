@@ -39,8 +39,7 @@
 # Additional Comments:
 #    Used to connect the agent and the UUT's bus.
 ##################################################################################################
-import cocotb
-from cocotb.triggers import *
+from cocotb.triggers import Timer
 from uvm.base.sv import sv_if
 
 class wb4s_if(sv_if):
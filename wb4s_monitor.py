@@ -39,16 +39,15 @@
 # Additional Comments:
 #
 ##################################################################################################
-import cocotb
-from cocotb.triggers import *
+from cocotb.triggers import First, RisingEdge
+from cocotb.utils import get_sim_time
 #
-from uvm.base.uvm_callback import *
+from uvm.base.uvm_object_globals import UVM_FULL, UVM_LOW
 from uvm.comps.uvm_monitor import UVMMonitor
-from uvm.tlm1 import *
-from uvm.macros import *
+from uvm.tlm1.uvm_analysis_port import UVMAnalysisPort
+from uvm.macros import uvm_component_utils, uvm_error, uvm_info
 #
-from wb4s_seq import *
-from wb4s_if import *
+from wb4s_seq import wb4s_seq_creator
 
 class wb4s_monitor(UVMMonitor):
     """
@@ -73,6 +72,15 @@ class wb4s_monitor(UVMMonitor):
         self.cfg       = None  # config loaded by the agent
         self.errors    = 0
         self.num_items = 0
+        self.cycles    = 0     # clocks seen during run_phase, including skipped idle ones
+        self.idle      = 0     # consecutive clocks with cyc_i low
+        self.idle_threshold = 4  # idle clocks before sleeping until the bus wakes up, 0 disables
+        self.period    = None  # clock period in simulator steps, measured on the first clocks
+        self.last_edge = None
+        self.recorder  = None  # wb4s_flight_recorder
+        self.signature = None  # wb4s_signature of the monitored stream
+        self.filter    = None  # wb4s_filter of the requests turned into transactions
+        self.creator   = None  # wb4s_seq_creator, factory resolved once at the start of run_phase
         self.tag       = "wb4s_monitor_" + name
 
 
@@ -87,6 +95,20 @@ class wb4s_monitor(UVMMonitor):
              phase: build_phase
         """
         self.ap = UVMAnalysisPort("ap", self)
+        # The optional parts are only imported when the config enables them.
+        if (self.cfg is not None and self.cfg.flight_depth + self.cfg.flight_samples > 0):
+            from wb4s_flight_recorder import wb4s_flight_recorder
+            self.recorder = wb4s_flight_recorder(self.get_full_name(), self.cfg.flight_depth,
+                                                 self.cfg.flight_samples, self.cfg.flight_file)
+        if (self.cfg is None or self.cfg.has_signature):
+            from wb4s_signature import wb4s_signature
+            if (self.cfg is not None):
+                self.signature = wb4s_signature(self.cfg.signature_fields, self.cfg.signature_window)
+            else:
+                self.signature = wb4s_signature()
+        if (self.cfg is not None):
+            self.idle_threshold = self.cfg.idle_threshold
+            self.filter    = self.cfg.filter
 
 
     async def run_phase(self, phase):
@@ -99,31 +121,55 @@ class wb4s_monitor(UVMMonitor):
            Args:
              phase: run_phase
         """
+        self.creator = wb4s_seq_creator("tr", self)
         while True:
-            tr = None  # Clean transaction for every loop.
-            # Create sequence item for this transaction.
-            tr = wb4s_seq.type_id.create("tr", self)
-
-            await RisingEdge(self.vif.clk_i)
-
-            if (self.vif.cyc_i == 1 and self.vif.stb_i == 1 and self.vif.stall_o == 0):
-                # Load signals values into sequence item to describe the transaction
-                tr.address     = self.vif.adr_i.value.integer
-                tr.data_in     = self.vif.dat_i.value.integer
-                tr.select      = self.vif.sel_i.value.integer
-                tr.cycle       = self.vif.cyc_i.value.integer
-                tr.strobe      = self.vif.stb_i.value.integer
-                tr.address_tag = self.vif.tga_i.value.integer
-                tr.data_tag    = self.vif.tgd_i.value.integer
-                tr.cycle_tag   = self.vif.tgc_i.value.integer
+            if (self.idle_threshold > 0 and self.idle >= self.idle_threshold and self.period is not None):
+                await self.skip_idle()
+            else:
+                await RisingEdge(self.vif.clk_i)
+                self.measure_period()
+            self.sample()
+
+            if (self.vif.cyc_i != 1):
+                self.idle += 1
+                continue
+            self.idle = 0
+
+            if (self.vif.stb_i == 1 and self.vif.stall_o == 0):
+                address     = self.vif.adr_i.value.integer
+                select      = self.vif.sel_i.value.integer
+                address_tag = self.vif.tga_i.value.integer
+                data_tag    = self.vif.tgd_i.value.integer
+                cycle_tag   = self.vif.tgc_i.value.integer
+                # Filtered out requests are followed on the bus but no transaction is built.
+                accepted = (self.filter is None or
+                            self.filter.accept(address, self.vif.we_i.value.integer, select,
+                                               address_tag, data_tag, cycle_tag))
+                if accepted:
+                    # Create sequence item for this transaction.
+                    tr = self.creator.create()
+                    # Load signals values into sequence item to describe the transaction
+                    tr.address     = address
+                    tr.data_in     = self.vif.dat_i.value.integer
+                    tr.select      = select
+                    tr.cycle       = self.vif.cyc_i.value.integer
+                    tr.strobe      = self.vif.stb_i.value.integer
+                    tr.address_tag = address_tag
+                    tr.data_tag    = data_tag
+                    tr.cycle_tag   = cycle_tag
                 
                 if (self.vif.we_i == 0):
                     while(self.vif.cyc_i == 1 or self.vif.ack_o == 0):
                         await RisingEdge(self.vif.clk_i)
+                        self.measure_period()
+                        self.sample()
                     #await RisingEdge(self.vif.ack_o) # wait for read response
                     #tr.data_tag    = self.vif.tgd_o.value.integer
                     #tr.data_out    = self.vif.dat_o.value.integer
 
+                if not accepted:
+                    continue
+
                 # Load response values into sequence item to describe the transaction
                 #tr.data_in     = self.vif.dat_i.value.integer
                 tr.data_tag    = self.vif.tgd_o.value.integer
@@ -133,8 +179,73 @@ class wb4s_monitor(UVMMonitor):
 
                 self.num_items += 1       # Increment transactions count
                 self.ap.write(tr) # Send transaction through analysis port
+                if (self.recorder is not None):
+                    self.recorder.record(tr)
+                if (self.signature is not None):
+                    self.signature.add(tr)
                 uvm_info(self.tag, tr.convert2string(), UVM_FULL)
                 #uvm_info(self.tag, tr.convert2string(), UVM_NONE)
 
 
+    def measure_period(self):
+        # Clock period from the first two consecutive edges, used to count skipped
+        # clocks. Called after every clock edge awaited outside skip_idle.
+        if (self.period is None):
+            now = get_sim_time()
+            if (self.last_edge is not None):
+                self.period = now - self.last_edge
+            self.last_edge = now
+
+
+    async def skip_idle(self):
+        """
+           Function: skip_idle
+
+           Definition: Sleeps while the bus is idle instead of waking on every
+                       clock. Returns on the first clock edge after cyc_i or
+                       stb_i rise, with the skipped clocks added to cycles.
+        """
+        start = get_sim_time()
+        await First(RisingEdge(self.vif.cyc_i), RisingEdge(self.vif.stb_i))
+        await RisingEdge(self.vif.clk_i)
+        # The edge we return on is counted by sample().
+        self.cycles += round((get_sim_time() - start) / self.period) - 1
+        self.idle = 0
+
+
+    def sample(self):
+        # Counts the clock and keeps its bus state in the flight recorder.
+        self.cycles += 1
+        if (self.recorder is not None):
+            self.recorder.sample(self.cycles, self.vif)
+
+
+    def report_phase(self, phase):
+        """
+           Function: report_phase
+
+           Definition: Reports the stream signature and compares it against the
+                       golden one, and the filter counters. Records the
+                       transaction count for wb4s_regression.
+
+           Args:
+             phase: report_phase
+        """
+        from wb4s_regression import record_result
+        if (self.signature is not None):
+            uvm_info(self.tag, "Stream signature 0x%08x over %d transactions" % (self.signature.signature,
+                     self.signature.count), UVM_LOW)
+            if (self.cfg is not None and self.cfg.signature_file is not None):
+                self.signature.save(self.cfg.signature_file)
+            if (self.cfg is not None and self.cfg.signature_golden is not None):
+                mismatch = self.signature.compare(self.cfg.signature_golden)
+                if mismatch is not None:
+                    uvm_error(self.tag, mismatch)
+        stats = {self.get_full_name() + ".num_items": self.num_items}
+        if (self.filter is not None):
+            uvm_info(self.tag, "Filter " + self.filter.convert2string(), UVM_LOW)
+            stats[self.get_full_name() + ".filter_seen"] = self.filter.seen
+        record_result(stats=stats)
+
+
 uvm_component_utils(wb4s_monitor)
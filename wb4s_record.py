@@ -0,0 +1,79 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_record.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_record
+# Description  : Flat integer form of a Wishbone transaction.
+#
+# Additional Comments:
+#   Shared by the components that store or hash transactions as plain
+#   integers. Imports nothing from uvm, cocotb or multiprocessing so every
+#   user of it stays cheap to load.
+##################################################################################################
+from collections import namedtuple
+
+# Transaction fields carried by every record, in record order.
+WB4S_RECORD_FIELDS = ("data_in",
+                      "data_out",
+                      "address",
+                      "select",
+                      "we",
+                      "strobe",
+                      "acknowledge",
+                      "cycle",
+                      "stall",
+                      "data_tag",
+                      "address_tag",
+                      "cycle_tag",
+                      "transmit_delay")
+
+wb4s_record = namedtuple("wb4s_record", WB4S_RECORD_FIELDS)
+
+# Records hold unsigned 64 bit words, wider buses keep their low bits.
+WB4S_RECORD_MASK = (1 << 64) - 1
+
+
+def pack_record(tr):
+    """
+       Function: pack_record
+
+       Definition: Convert a wb4s_seq (or any object with the same fields) into
+                   a tuple of integers in WB4S_RECORD_FIELDS order. Values
+                   are cut to their low 64 bits, negative ones taken as two's
+                   complement, so they always fit a record word.
+
+       Args:
+         tr: Transaction to convert.
+    """
+    return tuple(int(getattr(tr, field, 0)) & WB4S_RECORD_MASK for field in WB4S_RECORD_FIELDS)
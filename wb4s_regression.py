@@ -0,0 +1,318 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_regression.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_regression
+# Description  : Parallel seed sharded regression runner.
+#
+# Additional Comments:
+#   Runs every test/seed pair of a regression as its own simulator process,
+#   as many at a time as there are workers, and merges the per run results
+#   into one report. Each run writes its results to the file named by the
+#   WB4S_RESULT environment variable, see record_result. The agent and the
+#   monitor import it in their report_phase, so the runner's own imports
+#   are local.
+#
+#   python wb4s_regression.py --tests test_read,test_write --seeds 1-200 \
+#       -- make SIM=icarus TESTCASE={test} RANDOM_SEED={seed}
+##################################################################################################
+import json
+import os
+import sys
+import time
+
+RESULT_ENV = "WB4S_RESULT"
+
+
+def record_result(stats=None, coverage=None, errors=0, failures=None, uvm_errors=None):
+    """
+       Function: record_result
+
+       Definition: Adds results of the running simulation to its result file.
+                   Does nothing when the simulation was not started by
+                   wb4s_regression. Can be called by several components.
+
+       Args:
+         stats: Dictionary of counters, summed across runs.
+         coverage: Dictionary of coverage bitmaps (integers), OR'ed across runs.
+         errors: Number of errors found.
+         failures: List of failure messages.
+         uvm_errors: UVM_ERROR plus UVM_FATAL count of the report server. It is
+                     global to the simulation so it replaces the stored value.
+    """
+    path = os.environ.get(RESULT_ENV)
+    if not path:
+        return
+    result = _load(path) or _empty()
+    _merge(result, {"stats"      : stats or {},
+                    "coverage"   : coverage or {},
+                    "errors"     : errors,
+                    "uvm_errors" : 0,
+                    "failures"   : failures or []})
+    if uvm_errors is not None:
+        result["uvm_errors"] = uvm_errors
+    _dump(path, result)
+
+
+class wb4s_regression():
+    """
+       Class: Wishbone Regression Runner
+
+       Definition: Spreads test/seed runs over a pool of workers, keeps one
+                   record per finished run so an interrupted regression can be
+                   resumed, and merges the records into one report.
+    """
+
+    def __init__(self, command, tests, seeds, out_dir="regression", jobs=None, timeout=None):
+        """
+           Function: new
+
+           Definition: Regression constructor.
+
+           Args:
+             command: Command template, {test}, {seed}, {rundir} and {result} are replaced per run.
+             tests: List of test names.
+             seeds: List of integer seeds.
+             out_dir: Directory holding the run records and the report.
+             jobs: Number of simulations running at once, defaults to the core count.
+             timeout: Seconds before a run is killed and counted as failed, None waits forever.
+        """
+        self.command = command
+        self.tests   = tests
+        self.seeds   = seeds
+        self.out_dir = out_dir
+        self.jobs    = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.run_dir = os.path.join(out_dir, "runs")
+
+
+    def _record_path(self, test, seed):
+        return os.path.join(self.run_dir, "%s_%d.json" % (test, seed))
+
+
+    def schedule(self):
+        """
+           Function: schedule
+
+           Definition: Returns the runs left to do. Runs that failed in a previous
+                       invocation come first, runs that passed are skipped.
+        """
+        failed  = []
+        pending = []
+        for test in self.tests:
+            for seed in self.seeds:
+                record = _load(self._record_path(test, seed))
+                if record is None:
+                    pending.append((test, seed))
+                elif not record["passed"]:
+                    failed.append((test, seed))
+        return failed + pending
+
+
+    def run_one(self, test, seed):
+        """
+           Function: run_one
+
+           Definition: Runs one simulation and stores its record.
+
+           Args:
+             test: Test name.
+             seed: Seed.
+        """
+        import subprocess
+        rundir = os.path.join(self.run_dir, "%s_%d" % (test, seed))
+        result = os.path.abspath(os.path.join(rundir, "result.json"))
+        os.makedirs(rundir, exist_ok=True)
+        if os.path.exists(result):
+            os.remove(result)
+        fields  = {"test": test, "seed": seed, "rundir": os.path.abspath(rundir), "result": result}
+        command = [arg.format(**fields) for arg in self.command]
+        env     = dict(os.environ, WB4S_RESULT=result, WB4S_TEST=test, WB4S_SEED=str(seed))
+        start   = time.monotonic()
+        error   = None  # command could not be started
+        with open(os.path.join(rundir, "run.log"), "w") as log:
+            try:
+                # Own process group, so a timeout also kills the simulator make started.
+                proc = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT,
+                                        env=env, start_new_session=True)
+            except OSError as e:
+                proc  = None
+                error = e
+            returncode = None
+            if proc is not None:
+                try:
+                    returncode = proc.wait(timeout=self.timeout)
+                except subprocess.TimeoutExpired:
+                    _kill_group(proc)
+        record = _load(result) or _empty()
+        if (record["errors"] + record["uvm_errors"] > 0):
+            record["failures"].append("%d errors" % (record["errors"] + record["uvm_errors"]))
+        if error is not None:
+            record["failures"].append("could not start %s: %s" % (command[0], error))
+        elif returncode is None:
+            record["failures"].append("timed out after %s s" % self.timeout)
+        elif returncode != 0:
+            record["failures"].append("exited with code %d" % returncode)
+        elif not os.path.exists(result):
+            record["failures"].append("no results recorded")
+        record.update({"test"    : test,
+                       "seed"    : seed,
+                       "time"    : time.monotonic() - start,
+                       "passed"  : not record["failures"]})
+        _dump(self._record_path(test, seed), record)
+        return record
+
+
+    def run(self):
+        """
+           Function: run
+
+           Definition: Runs the scheduled simulations in parallel, then writes
+                       and returns the merged report.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        runs = self.schedule()
+        os.makedirs(self.run_dir, exist_ok=True)
+        print("wb4s_regression: %d runs on %d workers" % (len(runs), self.jobs))
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self.run_one, test, seed) for test, seed in runs]
+            for future in as_completed(futures):
+                record = future.result()
+                print("  %-4s %s seed %d (%.1f s)" % ("PASS" if record["passed"] else "FAIL",
+                      record["test"], record["seed"], record["time"]))
+        return self.report()
+
+
+    def report(self):
+        """
+           Function: report
+
+           Definition: Merges every run record of the regression into report.json.
+        """
+        report = dict(_empty(), runs=0, passed=0, failed=[], time=0.0)
+        for test in self.tests:
+            for seed in self.seeds:
+                record = _load(self._record_path(test, seed))
+                if record is None:
+                    continue
+                report["runs"] += 1
+                report["time"] += record["time"]
+                if record["passed"]:
+                    report["passed"] += 1
+                else:
+                    report["failed"].append({"test": test, "seed": seed, "failures": record["failures"]})
+                _merge(report, record)
+        # Per run messages are kept with their run in "failed".
+        del report["failures"]
+        report["coverage_bits"] = {name: bin(bitmap).count("1") for name, bitmap in report["coverage"].items()}
+        _dump(os.path.join(self.out_dir, "report.json"), report)
+        return report
+
+
+def _kill_group(proc):
+    import signal
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+def _empty():
+    return {"stats": {}, "coverage": {}, "errors": 0, "uvm_errors": 0, "failures": []}
+
+
+def _merge(into, record):
+    for name, value in record["stats"].items():
+        into["stats"][name] = into["stats"].get(name, 0) + value
+    for name, bitmap in record["coverage"].items():
+        into["coverage"][name] = into["coverage"].get(name, 0) | bitmap
+    into["errors"]     += record["errors"]
+    into["uvm_errors"] += record["uvm_errors"]
+    into["failures"].extend(record["failures"])
+
+
+def _load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _dump(path, data):
+    # Write then rename so an interrupted regression never leaves half a record.
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _parse_seeds(text):
+    seeds = []
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Parallel seed sharded regression runner.")
+    parser.add_argument("--tests", required=True, help="comma separated test names")
+    parser.add_argument("--seeds", required=True, help="seeds, e.g. 1-100 or 3,7,11")
+    parser.add_argument("--jobs", type=int, default=None, help="simulations at once, default core count")
+    parser.add_argument("--out", default="regression", help="output directory, reused to resume")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per run")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="-- followed by the simulation command, may use {test} {seed} {rundir} {result}")
+    args    = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("missing simulation command")
+    regression = wb4s_regression(command, args.tests.split(","), _parse_seeds(args.seeds),
+                                 args.out, args.jobs, args.timeout)
+    report = regression.run()
+    print("wb4s_regression: %d/%d passed, %d errors, report in %s" % (report["passed"], report["runs"],
+          report["errors"] + report["uvm_errors"], os.path.join(args.out, "report.json")))
+    for failed in report["failed"]:
+        print("  FAIL %s seed %d: %s" % (failed["test"], failed["seed"], "; ".join(failed["failures"])))
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,13 +33,21 @@
 # File name    : wb4s_seq.py
 # Author       : Jose R Garcia (jg-fossh@protonmail.com)
 # Project Name : UVM Python Verification Library
-# Class Name   : wb4s_seq, wb4s_base_sequence
+# Class Name   : wb4s_seq, wb4s_seq_creator, wb4s_base_sequence
 # Description  : Wishbone Pipeline Interface Sequence Item and Sequences.
 #
 # Additional Comments:
 #   Create read or write transaction sequences.
 ##################################################################################################
-from uvm import *
+import copy
+import random
+#
+from uvm.base.sv import sv, sv_obj
+from uvm.base.uvm_object import UVMObject
+from uvm.base.uvm_pool import UVMEventPool
+from uvm.seq.uvm_sequence import UVMSequence
+from uvm.seq.uvm_sequence_item import UVMSequenceItem
+from uvm.macros import uvm_do_with, uvm_object_utils
 
 class wb4s_seq(UVMSequenceItem):
     """         
@@ -48,6 +56,43 @@ class wb4s_seq(UVMSequenceItem):
        Definition: Contains functions, tasks and methods of this
     """
 
+    # Transaction and sequence bookkeeping a clone starts with, the values the
+    # UVMSequenceItem constructor sets.
+    _CLONE_STATE = {"initiator"           : None,
+                    "m_transaction_id"    : -1,
+                    "stream_handle"       : None,
+                    "tr_recorder"         : None,
+                    "begin_time"          : -1,
+                    "end_time"            : -1,
+                    "accept_time"         : -1,
+                    "m_sequence_id"       : -1,
+                    "m_use_sequence_info" : False,
+                    "m_depth"             : -1,
+                    "m_sequencer"         : None,
+                    "p_sequencer"         : None,
+                    "m_parent_sequence"   : None,
+                    "print_sequence_info" : False,
+                    "_events"             : None,
+                    "_begin_event"        : None,
+                    "_end_event"          : None}
+
+    # Randomization containers of sv_obj, copied so clones do not share them.
+    _CLONE_CONTAINERS = ("_randVariables", "_simpleConstraints", "_implConstraints",
+                         "_implDistributions", "_simpleDistributions", "_solve_order",
+                         "_sv_rand_obj")
+
+    # Field block copied by do_copy. A subclass that adds fields extends both,
+    # otherwise its items are cloned through create() and copy().
+    _CLONE_FIELDS = ("data_in", "data_out", "address", "select", "we", "strobe",
+                     "acknowledge", "cycle", "stall", "data_tag", "address_tag",
+                     "cycle_tag", "transmit_delay")
+
+    _clone_known = None  # attribute names a fast clone rebuilds, set per class
+
+    _events      = None
+    _begin_event = None
+    _end_event   = None
+
     def __init__(self, name="wb4s_seq"):
         super().__init__(name)
         self.data_in        = 0 
@@ -58,10 +103,44 @@ class wb4s_seq(UVMSequenceItem):
         self.strobe         = 0
         self.acknowledge    = 0
         self.cycle          = 0 
+        self.stall          = 0
         self.data_tag       = 0 
         self.address_tag    = 0
         self.cycle_tag      = 0
         self.transmit_delay = 0 
+
+
+    # The transaction events are created on first use, so a fast clone gets
+    # its own without paying for them up front.
+    @property
+    def events(self):
+        if self._events is None:
+            self._events = UVMEventPool()
+        return self._events
+
+    @events.setter
+    def events(self, pool):
+        self._events = pool
+
+    @property
+    def begin_event(self):
+        if self._begin_event is None:
+            self._begin_event = self.events.get("begin")
+        return self._begin_event
+
+    @begin_event.setter
+    def begin_event(self, event):
+        self._begin_event = event
+
+    @property
+    def end_event(self):
+        if self._end_event is None:
+            self._end_event = self.events.get("end")
+        return self._end_event
+
+    @end_event.setter
+    def end_event(self, event):
+        self._end_event = event
         
 
     def do_copy(self, rhs):
@@ -72,6 +151,7 @@ class wb4s_seq(UVMSequenceItem):
         self.we             = rhs.we        
         self.strobe         = rhs.strobe        
         self.cycle          = rhs.cycle         
+        self.stall          = rhs.stall
         self.data_tag       = rhs.data_tag      
         self.address_tag    = rhs.address_tag   
         self.cycle_tag      = rhs.cycle_tag
@@ -79,9 +159,49 @@ class wb4s_seq(UVMSequenceItem):
         self.transmit_delay = rhs.transmit_delay
 
 
+    def clone(self):
+        # Scoreboards clone items through here, take the fast path.
+        return self.do_clone()
+
+
     def do_clone(self):
-        new_obj = wb4s_seq()
-        new_obj.copy(self)
+        """
+           Function: do_clone
+
+           Definition: Fast clone. Builds a new object of the same type without
+                       running the sequence item constructor, which dominates
+                       the cost of creating an item, and fills it with do_copy.
+                       The transaction and sequence state starts fresh, with
+                       its own events and random seed, as in clone(). Items with
+                       attributes outside _CLONE_FIELDS go through create() and
+                       copy() instead.
+        """
+        cls   = type(self)
+        known = cls.__dict__.get("_clone_known")
+        if known is None:
+            known = frozenset(self._CLONE_STATE).union(self._CLONE_CONTAINERS, self._CLONE_FIELDS,
+                                                       ("name", "leaf_name", "inst_id", "_sv_seed",
+                                                        "_sv_rand_state", "_rand_mode"))
+            cls._clone_known = known
+        if not (self.__dict__.keys() <= known):
+            return UVMObject.clone(self)
+        new_obj = cls.__new__(cls)
+        state   = new_obj.__dict__
+        state.update(self._CLONE_STATE)
+        for name in self._CLONE_CONTAINERS:
+            if name in self.__dict__:
+                state[name] = copy.copy(self.__dict__[name])
+        state["name"]       = self.name
+        state["leaf_name"]  = self.leaf_name
+        state["_rand_mode"] = self._rand_mode
+        state["inst_id"]    = UVMObject.m_inst_count
+        UVMObject.m_inst_count += 1
+        # Seeded as the sv_obj constructor does.
+        state["_sv_seed"] = sv.urandom()
+        random.seed(state["_sv_seed"])
+        state["_sv_rand_state"] = random.getstate()
+        sv_obj.num_objs += 1
+        new_obj.do_copy(self)
         return new_obj
 
     def compare(self, rhs):
@@ -122,6 +242,33 @@ class wb4s_seq(UVMSequenceItem):
 uvm_object_utils(wb4s_seq)
 
 
+class wb4s_seq_creator():
+    """
+       Class: Wishbone Sequence Item Creator
+
+       Definition: Resolves the factory once for a context, then creates items
+                   by cloning a prototype of the resolved type. Overrides set
+                   before the creator is built are honored, later ones are not.
+    """
+
+    def __init__(self, name, parent=None):
+        """
+           Function: new
+
+           Definition: Builds the prototype through the factory.
+
+           Args:
+             name: Name of the created items, used for instance overrides.
+             parent: Component creating the items.
+        """
+        self.prototype = wb4s_seq.type_id.create(name, parent)
+
+
+    def create(self):
+        # New item with the prototype's default field values.
+        return self.prototype.do_clone()
+
+
 class wb4s_base_sequence(UVMSequence):
 
     def __init__(self, name="wb4s_base_sequence"):
@@ -131,6 +278,27 @@ class wb4s_base_sequence(UVMSequence):
         self.rsp = wb4s_seq()
 
 
+    async def send_items(self, items):
+        """
+           Function: send_items
+
+           Definition: Hands the items to the driver. When the sequencer's fast
+                       FIFO is drained by a wb4s_driver they go through it in
+                       one call and this waits until the driver retired them,
+                       otherwise each item is started and finished on the
+                       sequencer as usual.
+
+           Args:
+             items: List of wb4s_seq.
+        """
+        if getattr(self.m_sequencer, "bulk_consumer", False):
+            count = await self.m_sequencer.put_items(items)
+            await self.m_sequencer.wait_for_items_done(count)
+        else:
+            for item in items:
+                await uvm_do_with(self, item)
+
+
 uvm_object_utils(wb4s_base_sequence)
 
 
@@ -167,7 +335,7 @@ class wb4s_single_read_seq(wb4s_base_sequence):
         self.req.acknowledge    = self.acknowledge
         self.req.transmit_delay = self.transmit_delay
 
-        await uvm_do_with(self, self.req) # start_item 
+        await self.send_items([self.req])
 
 
 uvm_object_utils(wb4s_single_read_seq)
@@ -206,7 +374,7 @@ class wb4s_single_write_seq(wb4s_base_sequence):
         self.req.acknowledge    = self.acknowledge
         self.req.transmit_delay = self.transmit_delay
 
-        await uvm_do_with(self, self.req) # start_item 
+        await self.send_items([self.req])
 
 
 uvm_object_utils(wb4s_single_write_seq)
@@ -37,9 +37,16 @@
 # Description  : Wishbone Master Sequencer.
 #
 # Additional Comments:
-#
+#   Besides the regular sequencer path it holds a bounded FIFO of items that
+#   sequences push in bulk with put_items and the driver pulls in bulk with
+#   get_next_items/try_next_items, without per item arbitration or handshake.
 ##################################################################################################
-from uvm import *
+from collections import deque
+#
+from cocotb.triggers import Event
+#
+from uvm.seq.uvm_sequencer import UVMSequencer
+from uvm.macros import uvm_component_utils
 
 class wb4s_sequencer(UVMSequencer):
     """         
@@ -59,7 +66,108 @@ class wb4s_sequencer(UVMSequencer):
              name: This agents name.
              parent: NONE
         """
-        self.seq_item_export = UVMBlockingPeekPort("seq_item_export", self)
+        self.depth           = 64       # maximum items waiting in the fast FIFO
+        self.items           = deque()  # fast FIFO, oldest item on the left
+        self.num_put         = 0        # items pushed since the start of the test
+        self.num_done        = 0        # items the driver finished with
+        self.bulk_consumer   = False    # set by the agent when a driver drains the fast FIFO
+        self.item_available  = Event("item_available")
+        self.space_available = Event("space_available")
+        self.item_retired    = Event("item_retired")
+
+
+    async def put_items(self, items):
+        """         
+           Function: put_items
+          
+           Definition: Pushes items into the fast FIFO in order. Waits while the
+                       FIFO is full. Returns the count the items are retired at,
+                       see wait_for_items_done.
+
+           Args:
+             items: List of wb4s_seq.
+        """
+        index = 0
+        while (index < len(items)):
+            space = self.depth - len(self.items)
+            if (space <= 0):
+                self.space_available.clear()
+                await self.space_available.wait()
+                continue
+            chunk = items[index:index + space]
+            self.items.extend(chunk)
+            # Count as queued so tickets of other sequences stay in FIFO order.
+            self.num_put += len(chunk)
+            index        += space
+            self.item_available.set()
+        return self.num_put
+
+
+    async def wait_for_items_done(self, count):
+        # Waits until the driver retired the first count items.
+        while (self.num_done < count):
+            self.item_retired.clear()
+            await self.item_retired.wait()
+
+
+    def try_next_items(self, n=1):
+        """         
+           Function: try_next_items
+          
+           Definition: Takes up to n items from the fast FIFO without waiting.
+                       Returns an empty list when there are none.
+
+           Args:
+             n: Maximum number of items to take.
+        """
+        count = min(n, len(self.items))
+        batch = [self.items.popleft() for _ in range(count)]
+        if (count > 0):
+            self.space_available.set()
+        return batch
+
+
+    async def get_next_items(self, n=1):
+        """         
+           Function: get_next_items
+          
+           Definition: Takes up to n items from the fast FIFO, waiting until at
+                       least one is available.
+
+           Args:
+             n: Maximum number of items to take.
+        """
+        while not self.items:
+            self.item_available.clear()
+            await self.item_available.wait()
+        return self.try_next_items(n)
+
+
+    def has_items(self):
+        return len(self.items) > 0
+
+
+    def has_do_available(self):
+        # True when a regular sequence waits for grant. The uvm-python
+        # UVMSequencer does not provide it.
+        for index in range(self.arb_sequence_q.size()):
+            sequence = self.arb_sequence_q.get(index).sequence_ptr
+            if (sequence.is_relevant() and not self.is_blocked(sequence)):
+                return True
+        return False
+
+
+    def items_done(self, count=1):
+        """         
+           Function: items_done
+          
+           Definition: The driver finished driving count items from the fast FIFO.
+
+           Args:
+             count: Number of items retired.
+        """
+        self.num_done += count
+        self.item_retired.set()
 
 
 uvm_component_utils(wb4s_sequencer)
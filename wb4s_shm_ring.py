@@ -0,0 +1,307 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_shm_ring.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_shm_ring, wb4s_stream_consumer
+# Description  : Shared memory ring buffer of Wishbone transactions.
+#
+# Additional Comments:
+#   Single producer, single consumer ring of fixed size records. The producer
+#   side lives in the simulator (see wb4s_stream_subscriber), the consumer side
+#   runs in a separate process. This module does not import uvm or cocotb so
+#   the analysis processes stay light.
+##################################################################################################
+import struct
+import time
+from multiprocessing import shared_memory
+#
+from wb4s_record import WB4S_RECORD_FIELDS, wb4s_record
+
+_RECORD = struct.Struct("<%dQ" % len(WB4S_RECORD_FIELDS))
+_WORD   = struct.Struct("<Q")
+
+# Header words, each one 64 bits wide.
+_HEAD     = 0  # records written by the producer
+_TAIL     = 1  # records consumed by the consumer
+_CLOSED   = 2  # producer finished, no more records coming
+_DONE     = 3  # consumer drained the ring and finished its checks
+_ERRORS   = 4  # errors reported back by the consumer
+_CAPACITY = 5  # number of record slots
+_ATTACHED = 6  # a consumer attached to the ring
+_HDR_SIZE = 64
+
+
+class wb4s_shm_ring():
+    """
+       Class: Shared Memory Transaction Ring
+
+       Definition: Fixed size ring of transaction records in a shared memory
+                   block. Only one process writes and only one process reads.
+    """
+
+    def __init__(self, name=None, capacity=4096, create=True):
+        """
+           Function: new
+
+           Definition: Create a new ring or attach to an existing one.
+
+           Args:
+             name: Shared memory block name. None lets the OS pick one when creating.
+             capacity: Number of record slots, only used when creating.
+             create: True for the producer, False for a consumer.
+        """
+        self.create = create
+        if (create):
+            size     = _HDR_SIZE + capacity * _RECORD.size
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.buf = self.shm.buf
+            self.buf[:_HDR_SIZE] = bytes(_HDR_SIZE)
+            self._set(_CAPACITY, capacity)
+        else:
+            self.shm = _attach(name)
+            self.buf = self.shm.buf
+        self.name     = self.shm.name
+        self.capacity = self._get(_CAPACITY)
+        self.stalls   = 0  # times the producer had to wait for the consumer
+
+
+    def _get(self, word):
+        return _WORD.unpack_from(self.buf, word * 8)[0]
+
+
+    def _set(self, word, value):
+        _WORD.pack_into(self.buf, word * 8, value)
+
+
+    def _slot(self, count):
+        return _HDR_SIZE + (count % self.capacity) * _RECORD.size
+
+
+    def put(self, values, timeout=None, alive=None):
+        """
+           Function: put
+
+           Definition: Write one record. Blocks while the ring is full, which is
+                       what applies back pressure to the simulator.
+
+           Args:
+             values: Tuple of integers in WB4S_RECORD_FIELDS order.
+             timeout: Seconds to wait for a free slot, None waits forever.
+             alive: Callable returning False once the consumer can no longer
+                    drain the ring, None only relies on timeout.
+        """
+        head = self._get(_HEAD)
+        if (head - self._get(_TAIL) >= self.capacity):
+            self.stalls += 1
+            if not _wait(lambda: head - self._get(_TAIL) < self.capacity, timeout, alive):
+                raise TimeoutError("wb4s_shm_ring " + self.name + " full, consumer not draining")
+        _RECORD.pack_into(self.buf, self._slot(head), *values)
+        # Publish the record only after its data is in place.
+        self._set(_HEAD, head + 1)
+
+
+    def get_all(self):
+        """
+           Function: get_all
+
+           Definition: Return every record written since the last call, oldest first.
+        """
+        head = self._get(_HEAD)
+        tail = self._get(_TAIL)
+        records = [wb4s_record._make(_RECORD.unpack_from(self.buf, self._slot(count)))
+                   for count in range(tail, head)]
+        self._set(_TAIL, head)
+        return records
+
+
+    def close(self):
+        # Producer side, no more records will be written.
+        self._set(_CLOSED, 1)
+
+
+    def closed(self):
+        return self._get(_CLOSED) == 1
+
+
+    def attach(self):
+        # Consumer side, tells the producer someone reads the ring.
+        self._set(_ATTACHED, 1)
+
+
+    def attached(self):
+        return self._get(_ATTACHED) == 1
+
+
+    def finish(self, errors=0):
+        # Consumer side, report back the result of the checks.
+        self._set(_ERRORS, errors)
+        self._set(_DONE, 1)
+
+
+    def errors(self):
+        return self._get(_ERRORS)
+
+
+    def wait_done(self, timeout=None, alive=None):
+        """
+           Function: wait_done
+
+           Definition: Producer side end of test synchronization. Waits until the
+                       consumer drained the ring and reported its result.
+                       Returns False on timeout or when the consumer died.
+
+           Args:
+             timeout: Seconds to wait, None waits forever.
+             alive: Callable returning False once the consumer is gone, None
+                    only relies on timeout.
+        """
+        return _wait(lambda: self._get(_DONE) == 1, timeout, alive)
+
+
+    def release(self):
+        # Detach from the block, the producer also removes it.
+        self.buf = None
+        self.shm.close()
+        if (self.create):
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class wb4s_stream_consumer():
+    """
+       Class: Transaction Stream Consumer
+
+       Definition: Consumer side of a wb4s_shm_ring. Runs checks and coverage
+                   in its own process while the simulator keeps advancing.
+    """
+
+    def __init__(self, name, poll=0.0005):
+        """
+           Function: new
+
+           Definition: Attach to the ring created by the simulator.
+
+           Args:
+             name: Shared memory block name published by wb4s_stream_subscriber.
+             poll: Seconds to sleep when the ring is empty.
+        """
+        self.ring      = wb4s_shm_ring(name, create=False)
+        self.ring.attach()
+        self.poll      = poll
+        self.num_items = 0
+
+
+    def __iter__(self):
+        while True:
+            # Check closed before draining so records written just before close are not lost.
+            closed  = self.ring.closed()
+            records = self.ring.get_all()
+            for record in records:
+                self.num_items += 1
+                yield record
+            if (closed and not records):
+                return
+            if not records:
+                time.sleep(self.poll)
+
+
+    def run(self, handler):
+        """
+           Function: run
+
+           Definition: Feed every record to handler until the producer closes the
+                       ring, then report the error count back to the simulator.
+
+           Args:
+             handler: Callable taking a wb4s_record. Returns the number of errors
+                      found (None or False count as no error) and may have a
+                      finish() method that returns the final error count.
+        """
+        errors = 0
+        try:
+            for record in self:
+                errors += int(handler(record) or 0)
+            if hasattr(handler, "finish"):
+                errors += int(handler.finish() or 0)
+        except Exception:
+            errors += 1
+            raise
+        finally:
+            self.ring.finish(errors)
+            self.ring.release()
+        return errors
+
+
+def run_consumer(name, handler):
+    """
+       Function: run_consumer
+
+       Definition: Process entry point, see wb4s_stream_consumer.run.
+
+       Args:
+         name: Shared memory block name.
+         handler: Callable taking a wb4s_record.
+    """
+    return wb4s_stream_consumer(name).run(handler)
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before python 3.13 the resource tracker of an attaching process unlinks
+        # the block when that process exits. Only the creator should do it. A
+        # process started by the producer shares its tracker and is left alone.
+        import multiprocessing
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        if (multiprocessing.parent_process() is None):
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _wait(condition, timeout, alive=None):
+    start = time.monotonic()
+    delay = 0.0
+    while not condition():
+        if (timeout is not None and time.monotonic() - start > timeout):
+            return False
+        if (alive is not None and not alive()):
+            # The consumer may have finished right before going away.
+            return condition()
+        time.sleep(delay)
+        delay = min(0.001, delay + 0.00001)
+    return True
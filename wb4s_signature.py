@@ -0,0 +1,153 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_signature.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_signature
+# Description  : Rolling signature of the transaction stream.
+#
+# Additional Comments:
+#   A CRC over the ordered transactions plus one CRC per window of N
+#   transactions. Comparing two runs then only needs the signatures, and the
+#   window CRCs point to where the streams start to differ.
+##################################################################################################
+import json
+import struct
+import zlib
+#
+from wb4s_record import WB4S_RECORD_FIELDS, pack_record
+
+# Fields left out unless asked for, they describe the stimulus not the bus.
+DEFAULT_EXCLUDE = ("transmit_delay",)
+
+
+class wb4s_signature():
+    """
+       Class: Wishbone Transaction Stream Signature
+
+       Definition: Incremental CRC32 over the selected fields of every
+                   transaction, with a checkpoint every window transactions.
+    """
+
+    def __init__(self, fields=None, window=1024):
+        """
+           Function: new
+
+           Definition: Signature constructor.
+
+           Args:
+             fields: Transaction fields covered, None covers all of WB4S_RECORD_FIELDS
+                     except DEFAULT_EXCLUDE.
+             window: Transactions per checkpoint, at least 1.
+        """
+        if (window < 1):
+            raise ValueError("wb4s_signature: window must be at least 1, got " + str(window))
+        if fields is None:
+            fields = [field for field in WB4S_RECORD_FIELDS if field not in DEFAULT_EXCLUDE]
+        for field in fields:
+            if field not in WB4S_RECORD_FIELDS:
+                raise ValueError("wb4s_signature: unknown field " + field)
+        self.fields     = list(fields)
+        self.window     = window
+        self.count      = 0
+        self.signature  = 0   # CRC of the whole stream so far
+        self.window_crc = 0   # CRC of the current window
+        self.windows    = []  # CRC of every completed window
+        self._index     = [WB4S_RECORD_FIELDS.index(field) for field in self.fields]
+        self._struct    = struct.Struct("<%dQ" % len(self.fields))
+
+
+    def add(self, tr):
+        """
+           Function: add
+
+           Definition: Folds one transaction into the signature.
+
+           Args:
+             tr: wb4s_seq transaction.
+        """
+        values          = pack_record(tr)
+        data            = self._struct.pack(*[values[index] for index in self._index])
+        self.signature  = zlib.crc32(data, self.signature)
+        self.window_crc = zlib.crc32(data, self.window_crc)
+        self.count     += 1
+        if (self.count % self.window == 0):
+            self.windows.append(self.window_crc)
+            self.window_crc = 0
+
+
+    def to_dict(self):
+        # The last, possibly partial, window is included in the checkpoints.
+        windows = list(self.windows)
+        if (self.count % self.window != 0):
+            windows.append(self.window_crc)
+        return {"fields"    : self.fields,
+                "window"    : self.window,
+                "count"     : self.count,
+                "signature" : self.signature,
+                "windows"   : windows}
+
+
+    def save(self, file_name):
+        with open(file_name, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+
+    def compare(self, golden):
+        """
+           Function: compare
+
+           Definition: Compares against a golden signature. Returns None when
+                       they match, otherwise a message naming the first window
+                       that differs.
+
+           Args:
+             golden: Dictionary from to_dict, or the name of a file written by save.
+        """
+        if isinstance(golden, str):
+            with open(golden) as f:
+                golden = json.load(f)
+        current = self.to_dict()
+        if (golden["fields"] != current["fields"] or golden["window"] != current["window"]):
+            return "signature settings differ from the golden run (fields %s window %d)" % (
+                   golden["fields"], golden["window"])
+        if (golden["signature"] == current["signature"] and golden["count"] == current["count"]):
+            return None
+        for index, (expected, actual) in enumerate(zip(golden["windows"], current["windows"])):
+            if (expected != actual):
+                break
+        else:
+            index = min(len(golden["windows"]), len(current["windows"]))
+        first = index * self.window
+        return "stream differs from the golden run in window %d (transactions %d to %d), %d vs %d transactions" % (
+               index, first, first + self.window - 1, current["count"], golden["count"])
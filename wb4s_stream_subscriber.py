@@ -0,0 +1,215 @@
+##################################################################################################
+# BSD 3-Clause License
+# 
+# Copyright (c) 2022, Jose R. Garcia
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+# 
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##################################################################################################
+# File name    : wb4s_stream_subscriber.py
+# Author       : Jose R Garcia (jg-fossh@protonmail.com)
+# Project Name : UVM Python Verification Library
+# Class Name   : wb4s_stream_subscriber
+# Description  : Streams monitored transactions to analysis processes.
+#
+# Additional Comments:
+#   Connect it to wb4s_agent.ap. Every transaction is copied into one shared
+#   memory ring per consumer process, scoreboards and coverage then run on
+#   other cores. See wb4s_shm_ring for the consumer side.
+##################################################################################################
+import multiprocessing
+#
+from uvm.base.uvm_object_globals import UVM_LOW
+from uvm.comps.uvm_subscriber import UVMSubscriber
+from uvm.macros import uvm_component_utils, uvm_error, uvm_info, uvm_warning
+#
+from wb4s_record import pack_record
+from wb4s_shm_ring import run_consumer, wb4s_shm_ring
+
+class wb4s_stream_subscriber(UVMSubscriber):
+    """
+       Class: Wishbone Transaction Stream Subscriber
+
+       Definition: Serializes transactions into shared memory rings read by
+                   separate analysis processes.
+    """
+
+    def __init__(self, name, parent=None):
+        super().__init__(name, parent)
+        """
+           Function: new
+
+           Definition: Class Constructor.
+
+           Args:
+             name: This components name.
+             parent: NONE
+        """
+        self.num_rings = 1     # one ring per consumer process
+        self.capacity  = 4096  # records per ring
+        self.timeout   = None  # seconds to wait on a stalled consumer, None waits forever
+        self.rings     = []
+        self.procs     = {}     # consumer process started by launch, by ring index
+        self.dead      = set()  # rings whose consumer went away, no longer written
+        self.errors    = 0
+        self.num_items = 0
+        self.tag       = "wb4s_stream_subscriber_" + name
+
+
+    def build_phase(self, phase):
+        super().build_phase(phase)
+        """
+           Function: build_phase
+
+           Definition: Creates the shared memory rings.
+
+           Args:
+             phase: build_phase
+        """
+        self.rings = [wb4s_shm_ring(capacity=self.capacity) for _ in range(self.num_rings)]
+        for ring in self.rings:
+            uvm_info(self.tag, "Streaming transactions to shared memory " + ring.name, UVM_LOW)
+
+
+    def ring_names(self):
+        # Names the consumer processes attach to, in ring order.
+        return [ring.name for ring in self.rings]
+
+
+    def launch(self, handler, ring=0):
+        """
+           Function: launch
+
+           Definition: Starts a consumer process reading one of the rings.
+
+           Args:
+             handler: Picklable callable taking a wb4s_record, see wb4s_stream_consumer.run.
+             ring: Index of the ring the process reads.
+        """
+        ctx  = multiprocessing.get_context("spawn")
+        proc = ctx.Process(target=run_consumer, args=(self.rings[ring].name, handler), daemon=True)
+        proc.start()
+        self.procs[ring] = proc
+        return proc
+
+
+    def consumer_alive(self, ring):
+        """
+           Function: consumer_alive
+
+           Definition: False once a ring can no longer be drained: its launched
+                       process exited, or nothing was launched and no consumer
+                       attached to it.
+
+           Args:
+             ring: Index of the ring.
+        """
+        proc = self.procs.get(ring)
+        if proc is not None:
+            return proc.is_alive()
+        return self.rings[ring].attached()
+
+
+    def _consumer_gone(self, ring, what):
+        proc = self.procs.get(ring)
+        if self.consumer_alive(ring):
+            reason = "timed out"
+        elif proc is not None:
+            reason = "exited with code " + str(proc.exitcode)
+        else:
+            reason = "is not attached"
+        uvm_error(self.tag, "Consumer of " + self.rings[ring].name + " " + reason + ", " + what)
+        self.dead.add(ring)
+        self.errors += 1
+
+
+    def write(self, t):
+        """
+           Function: write
+
+           Definition: Copies the transaction into every ring. Blocks the
+                       simulator while a consumer is a full ring behind.
+
+           Args:
+             t: wb4s_seq transaction from the monitor.
+        """
+        values = pack_record(t)
+        for index, ring in enumerate(self.rings):
+            if index in self.dead:
+                continue
+            try:
+                ring.put(values, self.timeout, lambda: self.consumer_alive(index))
+            except TimeoutError:
+                self._consumer_gone(index, "stopped streaming to it")
+        self.num_items += 1
+
+
+    def extract_phase(self, phase):
+        """
+           Function: extract_phase
+
+           Definition: End of test synchronization. Closes the rings and waits
+                       for every consumer to drain them and report its errors.
+                       Rings nobody reads are not waited on.
+
+           Args:
+             phase: extract_phase
+        """
+        for ring in self.rings:
+            ring.close()
+        for index, ring in enumerate(self.rings):
+            if index in self.dead:
+                continue
+            if (index not in self.procs and not ring.attached()):
+                uvm_warning(self.tag, "No consumer read " + ring.name)
+                continue
+            if (ring.wait_done(self.timeout, lambda: self.consumer_alive(index))):
+                self.errors += ring.errors()
+            else:
+                self._consumer_gone(index, "before finishing")
+        for proc in self.procs.values():
+            proc.join(self.timeout)
+
+
+    def check_phase(self, phase):
+        if (self.errors > 0):
+            uvm_error(self.tag, "Analysis processes reported " + str(self.errors) + " errors")
+
+
+    def report_phase(self, phase):
+        stalls = sum(ring.stalls for ring in self.rings)
+        uvm_info(self.tag, "Streamed " + str(self.num_items) + " transactions, producer stalled " +
+                 str(stalls) + " times", UVM_LOW)
+
+
+    def final_phase(self, phase):
+        for ring in self.rings:
+            ring.release()
+        self.rings = []
+
+
+uvm_component_utils(wb4s_stream_subscriber)